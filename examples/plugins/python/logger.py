@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
 Example Python plugin for apiproxyd that logs all requests and responses.
-This plugin communicates with the Go daemon via JSON-RPC over stdin/stdout.
+This plugin communicates with the Go daemon via JSON-RPC over stdin/stdout
+through the shared runtime in plugin_runtime.py.
 """
 
-import json
 import sys
 from datetime import datetime
 
+from plugin_runtime import cached_loads, loads, run
+
 
 class LoggerPlugin:
     def __init__(self):
         self.config = {}
+        self.verbose = True
+        # Refreshed once per batch by the shared runtime; avoids a clock
+        # read plus datetime formatting at every call site.
+        self._now = datetime.now().isoformat()
 
     def get_info(self):
         """Return plugin information"""
@@ -23,18 +29,18 @@ class LoggerPlugin:
     def init(self, config):
         """Initialize the plugin with configuration"""
         self.config = config
+        self.verbose = bool(config.get("verbose", True))
         self.log(f"Initialized with config: {config}")
         return {"status": "ok"}
 
     def on_request(self, request_json):
         """Called before proxying the request"""
-        request = json.loads(request_json)
-        self.log(f"{request['method']} Request to {request['endpoint']} at {datetime.now().isoformat()}")
+        request = loads(request_json)
+        if self.verbose:
+            self.log(f"{request['method']} Request to {request['endpoint']} at {self._now}")
 
         # Add custom header
-        if 'headers' not in request:
-            request['headers'] = {}
-        request['headers']['X-Plugin-Python-Logger'] = 'enabled'
+        request.setdefault('headers', {})['X-Plugin-Python-Logger'] = 'enabled'
 
         return {
             "request": request,
@@ -43,24 +49,26 @@ class LoggerPlugin:
 
     def on_response(self, request_json, response_json):
         """Called after receiving the upstream response"""
-        request = json.loads(request_json)
-        response = json.loads(response_json)
+        request = loads(request_json)
+        response = loads(response_json)
 
-        self.log(f"Response from {request['endpoint']}: status={response['status_code']}, size={len(response['body'])} bytes")
+        if self.verbose:
+            self.log(f"Response from {request['endpoint']}: status={response['status_code']}, size={len(response['body'])} bytes")
 
         # Add metadata
-        if 'metadata' not in response:
-            response['metadata'] = {}
-        response['metadata']['logged_at'] = datetime.now().isoformat()
+        response.setdefault('metadata', {})['logged_at'] = self._now
 
         return response
 
     def on_cache_hit(self, request_json, response_json):
         """Called when a cached response is found"""
-        request = json.loads(request_json)
-        response = json.loads(response_json)
+        # The same popular request repeats across cache hits and is only
+        # read here, so the memoized parse is safe.
+        request = cached_loads(request_json)
+        response = loads(response_json)
 
-        self.log(f"Cache HIT for {request['method']} {request['endpoint']}")
+        if self.verbose:
+            self.log(f"Cache HIT for {request['method']} {request['endpoint']}")
         return response
 
     def shutdown(self):
@@ -69,67 +77,10 @@ class LoggerPlugin:
         return {"status": "ok"}
 
     def log(self, message):
-        """Log a message to stderr"""
-        print(f"[Python Logger Plugin] {message}", file=sys.stderr, flush=True)
-
-
-def handle_rpc_call(plugin, method, params):
-    """Handle a JSON-RPC call"""
-    if method == "get_info":
-        return plugin.get_info()
-    elif method == "init":
-        return plugin.init(params[0] if params else {})
-    elif method == "on_request":
-        return plugin.on_request(params[0])
-    elif method == "on_response":
-        return plugin.on_response(params[0], params[1])
-    elif method == "on_cache_hit":
-        return plugin.on_cache_hit(params[0], params[1])
-    elif method == "shutdown":
-        return plugin.shutdown()
-    else:
-        raise ValueError(f"Unknown method: {method}")
-
-
-def main():
-    plugin = LoggerPlugin()
-
-    # Read JSON-RPC requests from stdin and write responses to stdout
-    for line in sys.stdin:
-        try:
-            request = json.loads(line.strip())
-
-            # Validate JSON-RPC request
-            if request.get("jsonrpc") != "2.0":
-                continue
-
-            method = request.get("method")
-            params = request.get("params", [])
-            req_id = request.get("id")
-
-            # Handle the RPC call
-            result = handle_rpc_call(plugin, method, params)
-
-            # Send response
-            response = {
-                "jsonrpc": "2.0",
-                "result": result,
-                "id": req_id
-            }
-            print(json.dumps(response), flush=True)
-
-        except Exception as e:
-            # Send error response
-            response = {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32000,
-                    "message": str(e)
-                },
-                "id": request.get("id") if 'request' in locals() else None
-            }
-            print(json.dumps(response), flush=True)
+        """Log a message to stderr when verbose logging is enabled"""
+        if self.verbose:
+            sys.stderr.write(f"[Python Logger Plugin] {message}\n")
 
 
 if __name__ == "__main__":
-    main()
+    run(LoggerPlugin())
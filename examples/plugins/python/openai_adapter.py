@@ -2,19 +2,48 @@
 """
 Example Python plugin that adapts OpenAI API requests to apiproxyd.
 This allows you to use apiproxyd as a proxy for OpenAI API with custom caching,
-rate limiting, and monitoring.
+rate limiting, and monitoring. The JSON-RPC loop lives in the shared
+runtime in plugin_runtime.py.
 """
 
-import json
 import sys
 import base64
 from datetime import datetime
 
+from plugin_runtime import cached_loads, dumps_bytes, loads, run
+
+
+# Proxy-side prefix for OpenAI endpoints, e.g.
+# /v1/openai/chat/completions -> /v1/chat/completions
+_PREFIX = '/v1/openai/'
+_PREFIX_LEN = len(_PREFIX)
+
+
+def _load_body(raw):
+    """Parse a request/response body into a JSON object.
+
+    Bodies may arrive as an already-parsed dict, as JSON str/bytes, or —
+    since the daemon marshals its []byte body fields with encoding/json —
+    as a base64 string wrapping JSON bytes. The base64 branch decodes
+    once and hands the raw bytes straight to the parser, with no
+    intermediate UTF-8 str. Returns (body, was_base64).
+    """
+    if isinstance(raw, dict):
+        return raw, False
+    try:
+        return loads(raw), False
+    except ValueError:
+        return loads(base64.b64decode(raw)), True
+
 
 class OpenAIAdapterPlugin:
     def __init__(self):
         self.config = {}
         self.api_key = None
+        self.verbose = True
+        # Refreshed once per batch by the shared runtime; avoids a clock
+        # read plus datetime formatting at every call site.
+        self._now = datetime.now().isoformat()
 
     def get_info(self):
         """Return plugin information"""
@@ -27,60 +56,77 @@ class OpenAIAdapterPlugin:
         """Initialize the plugin with configuration"""
         self.config = config
         self.api_key = config.get("openai_api_key", "")
+        self.verbose = bool(config.get("verbose", True))
         self.log(f"Initialized OpenAI adapter")
         return {"status": "ok"}
 
     def on_request(self, request_json):
         """Transform OpenAI API requests"""
-        request = json.loads(request_json)
+        request = loads(request_json)
 
         # Check if this is an OpenAI endpoint
-        if not request['endpoint'].startswith('/v1/openai/'):
+        endpoint = request['endpoint']
+        if not endpoint.startswith(_PREFIX):
             return {"request": request, "continue": True}
 
-        self.log(f"Processing OpenAI request to {request['endpoint']}")
+        if self.verbose:
+            self.log(f"Processing OpenAI request to {endpoint}")
 
         # Add OpenAI authentication header if configured
         if self.api_key:
-            if 'headers' not in request:
-                request['headers'] = {}
-            request['headers']['Authorization'] = f'Bearer {self.api_key}'
+            request.setdefault('headers', {})['Authorization'] = f'Bearer {self.api_key}'
 
-        # Transform the endpoint to actual OpenAI API
-        # /v1/openai/chat/completions -> /v1/chat/completions
-        original_endpoint = request['endpoint']
-        request['endpoint'] = original_endpoint.replace('/v1/openai/', '/v1/')
+        # Transform the endpoint to the actual OpenAI API. The prefix
+        # is already verified, so a slice beats a full-string replace.
+        request['endpoint'] = '/v1/' + endpoint[_PREFIX_LEN:]
 
         # Store original endpoint for later
-        if 'metadata' not in request:
-            request['metadata'] = {}
-        request['metadata']['original_endpoint'] = original_endpoint
-        request['metadata']['provider'] = 'openai'
+        metadata = request.setdefault('metadata', {})
+        metadata['original_endpoint'] = endpoint
+        metadata['provider'] = 'openai'
 
         # Parse and potentially modify the request body
         if request.get('body'):
             try:
-                body = json.loads(request['body']) if isinstance(request['body'], str) else request['body']
+                raw_body = request['body']
+                was_bytes = isinstance(raw_body, bytes)
+                body, was_b64 = _load_body(raw_body)
+                dirty = False
 
                 # Add custom parameters or transform the request
                 if 'model' not in body:
                     body['model'] = 'gpt-3.5-turbo'
+                    dirty = True
 
                 # Add usage tracking metadata
-                body['user'] = body.get('user', f"apiproxyd-{datetime.now().strftime('%Y%m%d')}")
-
-                request['body'] = json.dumps(body).encode('utf-8') if isinstance(request['body'], bytes) else json.dumps(body)
-
-                self.log(f"Transformed request for model: {body.get('model')}")
-            except json.JSONDecodeError:
+                if 'user' not in body:
+                    body['user'] = f"apiproxyd-{datetime.now().strftime('%Y%m%d')}"
+                    dirty = True
+
+                # Only pay for a re-serialize when the body actually
+                # changed; the untouched original passes through as-is.
+                # Serialize once to bytes and re-wrap in whatever form
+                # the body arrived in.
+                if dirty:
+                    encoded = dumps_bytes(body)
+                    if was_b64:
+                        request['body'] = base64.b64encode(encoded).decode()
+                    elif was_bytes:
+                        request['body'] = encoded
+                    else:
+                        request['body'] = encoded.decode()
+
+                if self.verbose:
+                    self.log(f"Transformed request for model: {body.get('model')}")
+            except ValueError:
                 self.log("Warning: Could not parse request body as JSON")
 
         return {"request": request, "continue": True}
 
     def on_response(self, request_json, response_json):
         """Transform OpenAI API responses"""
-        request = json.loads(request_json)
-        response = json.loads(response_json)
+        request = loads(request_json)
+        response = loads(response_json)
 
         # Only process OpenAI responses
         if request.get('metadata', {}).get('provider') != 'openai':
@@ -88,42 +134,45 @@ class OpenAIAdapterPlugin:
 
         try:
             # Parse the response body
-            body = json.loads(response['body']) if isinstance(response['body'], str) else response['body']
+            body, _ = _load_body(response['body'])
 
             # Add custom metadata
-            if 'metadata' not in response:
-                response['metadata'] = {}
+            metadata = response.setdefault('metadata', {})
 
             # Extract usage information
             if 'usage' in body:
-                response['metadata']['tokens_used'] = str(body['usage'].get('total_tokens', 0))
-                response['metadata']['prompt_tokens'] = str(body['usage'].get('prompt_tokens', 0))
-                response['metadata']['completion_tokens'] = str(body['usage'].get('completion_tokens', 0))
+                usage = body['usage']
+                metadata['tokens_used'] = str(usage.get('total_tokens', 0))
+                metadata['prompt_tokens'] = str(usage.get('prompt_tokens', 0))
+                metadata['completion_tokens'] = str(usage.get('completion_tokens', 0))
 
             # Extract model information
             if 'model' in body:
-                response['metadata']['model'] = body['model']
+                metadata['model'] = body['model']
 
-            self.log(f"Response processed: tokens={response['metadata'].get('tokens_used', 'unknown')}")
+            if self.verbose:
+                self.log(f"Response processed: tokens={metadata.get('tokens_used', 'unknown')}")
 
-        except json.JSONDecodeError:
+        except ValueError:
             self.log("Warning: Could not parse response body as JSON")
 
         return response
 
     def on_cache_hit(self, request_json, response_json):
         """Handle cached OpenAI responses"""
-        request = json.loads(request_json)
-        response = json.loads(response_json)
+        # The same popular request repeats across cache hits and is only
+        # read here, so the memoized parse is safe.
+        request = cached_loads(request_json)
+        response = loads(response_json)
 
         if request.get('metadata', {}).get('provider') == 'openai':
-            self.log(f"Cache HIT for OpenAI request - saved API costs!")
+            if self.verbose:
+                self.log(f"Cache HIT for OpenAI request - saved API costs!")
 
             # Add cache metadata
-            if 'metadata' not in response:
-                response['metadata'] = {}
-            response['metadata']['cached'] = 'true'
-            response['metadata']['cache_hit_at'] = datetime.now().isoformat()
+            metadata = response.setdefault('metadata', {})
+            metadata['cached'] = 'true'
+            metadata['cache_hit_at'] = self._now
 
         return response
 
@@ -133,63 +182,10 @@ class OpenAIAdapterPlugin:
         return {"status": "ok"}
 
     def log(self, message):
-        """Log a message to stderr"""
-        print(f"[OpenAI Adapter] {message}", file=sys.stderr, flush=True)
-
-
-def handle_rpc_call(plugin, method, params):
-    """Handle a JSON-RPC call"""
-    if method == "get_info":
-        return plugin.get_info()
-    elif method == "init":
-        return plugin.init(params[0] if params else {})
-    elif method == "on_request":
-        return plugin.on_request(params[0])
-    elif method == "on_response":
-        return plugin.on_response(params[0], params[1])
-    elif method == "on_cache_hit":
-        return plugin.on_cache_hit(params[0], params[1])
-    elif method == "shutdown":
-        return plugin.shutdown()
-    else:
-        raise ValueError(f"Unknown method: {method}")
-
-
-def main():
-    plugin = OpenAIAdapterPlugin()
-
-    # Read JSON-RPC requests from stdin and write responses to stdout
-    for line in sys.stdin:
-        try:
-            request = json.loads(line.strip())
-
-            if request.get("jsonrpc") != "2.0":
-                continue
-
-            method = request.get("method")
-            params = request.get("params", [])
-            req_id = request.get("id")
-
-            result = handle_rpc_call(plugin, method, params)
-
-            response = {
-                "jsonrpc": "2.0",
-                "result": result,
-                "id": req_id
-            }
-            print(json.dumps(response), flush=True)
-
-        except Exception as e:
-            response = {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32000,
-                    "message": str(e)
-                },
-                "id": request.get("id") if 'request' in locals() else None
-            }
-            print(json.dumps(response), flush=True)
+        """Log a message to stderr when verbose logging is enabled"""
+        if self.verbose:
+            sys.stderr.write(f"[OpenAI Adapter] {message}\n")
 
 
 if __name__ == "__main__":
-    main()
+    run(OpenAIAdapterPlugin())
@@ -9,6 +9,7 @@ import sys
 import subprocess
 import platform
 import shutil
+import time
 from pathlib import Path
 
 VERSION = "0.1.0"
@@ -45,25 +46,24 @@ def check_requirements():
     os_type = platform.system()
     print(f"  OS: {os_type} {platform.release()}")
 
-    # Check Go
-    try:
-        result = subprocess.run(['go', 'version'], capture_output=True, text=True)
-        go_version = result.stdout.strip()
-        print(f"  ✓ Go: {go_version}")
-    except FileNotFoundError:
+    # Check Go; a PATH search is enough to know it exists, so only
+    # spawn `go version` on the happy path
+    if shutil.which('go') is None:
         print_colored("  ✗ Go not found!", 'red')
         print_colored("  Please install Go 1.21+ from https://go.dev/dl/", 'yellow')
         return False
 
+    result = subprocess.run(['go', 'version'], capture_output=True, text=True)
+    print(f"  ✓ Go: {result.stdout.strip()}")
+
     # Check Git
-    try:
-        subprocess.run(['git', '--version'], capture_output=True, text=True)
-        print("  ✓ Git: Installed")
-    except FileNotFoundError:
+    if shutil.which('git') is None:
         print_colored("  ✗ Git not found!", 'red')
         print_colored("  Please install Git", 'yellow')
         return False
 
+    print("  ✓ Git: Installed")
+
     return True
 
 
@@ -81,8 +81,7 @@ def build_binary():
         except:
             commit = 'dev'
 
-        from datetime import datetime
-        build_date = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        build_date = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
 
         # Build command
         ldflags = f'-ldflags=-X main.version={VERSION} -X main.commit={commit} -X main.date={build_date}'
@@ -177,7 +176,6 @@ def create_config():
         return True
     else:
         # Create minimal config
-        import json
         config = {
             "server": {
                 "host": "127.0.0.1",
@@ -196,8 +194,13 @@ def create_config():
             "whitelisted_endpoints": ["/v1/*"]
         }
 
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        try:
+            import orjson
+            config_file.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        except ImportError:
+            import json
+            with open(config_file, 'w') as f:
+                json.dump(config, f, indent=2)
 
         print_colored(f"  ✓ Config created: {config_file}", 'green')
         print_colored(f"  ⚠ Edit config and add your API key!", 'yellow')
@@ -46,9 +46,17 @@ type RPCError struct {
 	Message string `json:"message"`
 }
 
-// LoadPythonPlugin loads a Python plugin from the specified path
+// LoadPythonPlugin loads a Python plugin from the specified path.
+// The plugin config may set "interpreter" (e.g. "pypy3") to run the
+// plugin under an alternative Python implementation; it defaults to
+// "python3".
 func LoadPythonPlugin(path string, config map[string]interface{}) (Plugin, error) {
-	cmd := exec.Command("python3", path)
+	interpreter := "python3"
+	if v, ok := config["interpreter"].(string); ok && v != "" {
+		interpreter = v
+	}
+
+	cmd := exec.Command(interpreter, path)
 
 	stdin, err := cmd.StdinPipe()
 	if err != nil {